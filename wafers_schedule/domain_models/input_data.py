@@ -1,4 +1,9 @@
+from collections import defaultdict
+from functools import cached_property
+from operator import attrgetter
+
 from domain_models.machine import Machine
+from domain_models.recipe import RecipeId
 from domain_models.wafer import Wafer
 from services.csv_reader import CsvReader
 
@@ -7,6 +12,33 @@ class InputData:
     def __init__(self, wafers: list[Wafer], machines: list[Machine]):
         self.wafers = wafers
         self.machines = machines
+        self.machines_by_recipe = self._index_machines_by_recipe()
+
+    def _index_machines_by_recipe(self) -> dict[RecipeId, list[Machine]]:
+        """
+        Builds the recipe -> machines adjacency once, so that each wafer's compatible machines are a dict lookup
+        rather than a scan over all machines.
+        """
+        machines_by_recipe: dict[RecipeId, list[Machine]] = defaultdict(list)
+        for machine in self.machines:
+            for recipe in machine.processing_time_by_recipe:
+                machines_by_recipe[recipe].append(machine)
+        return dict(machines_by_recipe)
+
+    @cached_property
+    def wafers_sorted_by_priority(self) -> tuple[Wafer, ...]:
+        """
+        Wafers sorted by priority, ties broken alphabetically. Computed once and shared by every scheduler run on this
+        input, hence immutable.
+        """
+        return tuple(sorted(self.wafers, key=attrgetter("priority_id", "name")))
+
+    @cached_property
+    def machines_sorted_by_name(self) -> tuple[Machine, ...]:
+        """
+        Machines sorted alphabetically, shared in the same way.
+        """
+        return tuple(sorted(self.machines, key=attrgetter("name")))
 
     @classmethod
     def from_csv(cls, path: str):
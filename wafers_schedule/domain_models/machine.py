@@ -1,15 +1,16 @@
-from datetime import timedelta
-
 from domain_models.recipe import RecipeId
 
 
 class Machine:
+    __slots__ = ("name", "processing_time_by_recipe")
+
     def __init__(
         self,
         name: str,
-        processing_time_by_recipe: dict[RecipeId, timedelta],
+        processing_time_by_recipe: dict[RecipeId, int],
     ):
         self.name = name
+        # Processing times in seconds, so that schedulers work with integer arithmetic
         self.processing_time_by_recipe = processing_time_by_recipe
 
     def __repr__(self):
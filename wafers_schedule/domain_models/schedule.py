@@ -1,10 +1,19 @@
-from datetime import datetime
+import csv
+from datetime import datetime, timedelta
+from functools import cached_property
+
+import numpy as np
 
 from domain_models.machine import Machine
 from domain_models.wafer import Wafer
 
+_EPOCH = datetime(1970, 1, 1)
+_ONE_SECOND = timedelta(seconds=1)
+
 
 class DispatchDecision:
+    __slots__ = ("wafer", "machine", "start", "end", "start_ts", "end_ts")
+
     def __init__(
         self,
         wafer: Wafer,
@@ -16,12 +25,73 @@ class DispatchDecision:
         self.machine = machine
         self.start = start
         self.end = end
+        # Epoch seconds, so that KPIs are computed with integer arithmetic instead of datetime/timedelta objects
+        self.start_ts = (start - _EPOCH) // _ONE_SECOND
+        self.end_ts = (end - _EPOCH) // _ONE_SECOND
 
 
 class Schedule:
-    def __init__(self, dispatch_decisions: list[DispatchDecision]):
+    def __init__(self, dispatch_decisions: list[DispatchDecision], release_timestamp: datetime | None = None):
+        """
+        Parameters
+        ----------
+        dispatch_decisions: list[DispatchDecision]
+            The wafers' machine assignments and processing times
+        release_timestamp: datetime | None
+            When the wafers became available for scheduling, from which cycle times are measured. Defaults to the
+            earliest start of the schedule, i.e. assumes that the first wafers were dispatched as soon as available
+        """
+        self.release_timestamp = release_timestamp
         self.dispatch_decisions = dispatch_decisions
 
+    @property
+    def release_timestamp(self) -> datetime | None:
+        return self._release_timestamp
+
+    @release_timestamp.setter
+    def release_timestamp(self, release_timestamp: datetime | None) -> None:
+        self._release_timestamp = release_timestamp
+        # Cycle times are measured from the release timestamp: drop the cached KPIs, if any
+        self.__dict__.pop("_kpis", None)
+
+    @property
+    def dispatch_decisions(self) -> list[DispatchDecision]:
+        return self._dispatch_decisions
+
+    @dispatch_decisions.setter
+    def dispatch_decisions(self, dispatch_decisions: list[DispatchDecision]) -> None:
+        self._dispatch_decisions = dispatch_decisions
+        # Drop the cached KPIs, if any: they belong to the previous dispatch decisions
+        self.__dict__.pop("_kpis", None)
+
+    @cached_property
+    def _kpis(self) -> tuple[float, float]:
+        """
+        Computes both KPIs from the start/end times (epoch seconds) and priority weights arrays of the dispatch
+        decisions. The result is cached until `dispatch_decisions` or `release_timestamp` is reassigned. An empty
+        schedule has zero makespan and cycle time.
+
+        Returns
+        -------
+        tuple[float, float] : Schedule's makespan in hours and priority-weighted cycle time in weighted hours
+        """
+        decisions = self.dispatch_decisions
+        count = len(decisions)
+        if count == 0:
+            return 0.0, 0.0
+        starts = np.fromiter((decision.start_ts for decision in decisions), dtype=np.int64, count=count)
+        ends = np.fromiter((decision.end_ts for decision in decisions), dtype=np.int64, count=count)
+        weights = np.fromiter((decision.wafer.priority_number for decision in decisions), dtype=np.float64, count=count)
+
+        first_start = starts.min()
+        if self.release_timestamp is None:
+            release_time = first_start
+        else:
+            release_time = (self.release_timestamp - _EPOCH) // _ONE_SECOND
+        makespan = float(ends.max() - first_start) / 3600.0
+        weighted_cycle_time = float(weights @ (ends - release_time)) / 3600.0
+        return makespan, weighted_cycle_time
+
     @property
     def makespan(self) -> float:
         """
@@ -30,7 +100,7 @@ class Schedule:
         -------
         float : Schedule's makespan in hours
         """
-        raise NotImplementedError
+        return self._kpis[0]
 
     @property
     def priority_weighted_cycle_time(self) -> float:
@@ -38,9 +108,9 @@ class Schedule:
 
         Returns
         -------
-        float : Schedule's priority-weighted cycle times summed for all wafers.
+        float : Schedule's priority-weighted cycle times summed for all wafers, measured from `release_timestamp`
         """
-        raise NotImplementedError
+        return self._kpis[1]
 
     def to_csv(self, output_file: str) -> None:
         """
@@ -55,4 +125,28 @@ class Schedule:
         -------
 
         """
-        raise NotImplementedError
+        starts = self._format_timestamps([decision.start_ts for decision in self.dispatch_decisions])
+        ends = self._format_timestamps([decision.end_ts for decision in self.dispatch_decisions])
+        with open(output_file, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["wafer", "priority", "machine", "start", "end"])
+            writer.writerows(
+                zip(
+                    [decision.wafer.name for decision in self.dispatch_decisions],
+                    [decision.wafer.priority for decision in self.dispatch_decisions],
+                    [decision.machine.name for decision in self.dispatch_decisions],
+                    starts,
+                    ends,
+                )
+            )
+
+    @staticmethod
+    def _format_timestamps(timestamps: list[int]) -> np.ndarray:
+        """
+        Formats epoch seconds as "YYYY-MM-DD HH:MM:SS" strings in one vectorized call.
+        """
+        if not timestamps:
+            # np.char.replace cannot size its output from an empty array
+            return np.array([], dtype=str)
+        as_strings = np.datetime_as_string(np.array(timestamps, dtype="datetime64[s]"), unit="s")
+        return np.char.replace(as_strings, "T", " ")
@@ -18,12 +18,28 @@ PRIORITY_WEIGHTS: dict[PriorityType, float] = {
     Priority.YELLOW: 0.1,
 }
 
+# Integer ids in decreasing order of priority (0 is the highest), so priority comparisons and sort keys are integer
+# compares rather than string lookups
+PRIORITY_IDS: dict[PriorityType, int] = {
+    Priority.RED: 0,
+    Priority.ORANGE: 1,
+    Priority.YELLOW: 2,
+}
+
+PRIORITY_WEIGHTS_BY_ID: tuple[float, ...] = tuple(
+    PRIORITY_WEIGHTS[priority] for priority in sorted(PRIORITY_IDS, key=PRIORITY_IDS.get)
+)
+
 
 class Wafer:
+    __slots__ = ("name", "priority", "recipe", "priority_id", "priority_number")
+
     def __init__(self, name: str, priority: PriorityType, recipe: RecipeId):
         self.name = name
         self.priority = priority
         self.recipe = recipe
+        self.priority_id = PRIORITY_IDS[priority]
+        self.priority_number = PRIORITY_WEIGHTS_BY_ID[self.priority_id]
 
     def __repr__(self):
         return f"{self.__class__.__name__}({self.name})"
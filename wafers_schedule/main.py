@@ -1,5 +1,5 @@
 from domain_models.input_data import InputData
-from services.schedulers import LegacyScheduler, BetterScheduler
+from services.schedulers import LegacyScheduler, BetterScheduler, CPSATScheduler
 from services.validators import ScheduleChecker
 
 if __name__ == "__main__":
@@ -23,3 +23,12 @@ if __name__ == "__main__":
         f"Priority-weighted cycle time : {new_schedule.priority_weighted_cycle_time:,.2f} hours"
     )
     new_schedule.to_csv(output_file="output/better_schedule.csv")
+
+    print("\n\n-- CP-SAT Scheduler ---------------")
+    cp_sat_schedule = CPSATScheduler(input_data=input_data).schedule()
+    ScheduleChecker(input_data=input_data, schedule=cp_sat_schedule).check()
+    print(f"Makespan                     : {cp_sat_schedule.makespan:,.2f} hours")
+    print(
+        f"Priority-weighted cycle time : {cp_sat_schedule.priority_weighted_cycle_time:,.2f} weighted hours"
+    )
+    cp_sat_schedule.to_csv(output_file="output/cp_sat_schedule.csv")
@@ -1,6 +1,19 @@
+import os
+import sys
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
 from domain_models.machine import Machine
+from domain_models.recipe import RecipeId
 from domain_models.wafer import Wafer
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Low-cardinality string columns are read as categories
+_WAFERS_DTYPES = {"name": "str", "priority": "category", "recipe": "category"}
+_MACHINES_RECIPES_DTYPES = {"machine": "category", "recipe": "category", "processing_time": "float64"}
+
 
 class CsvReader:
     def __init__(self, path: str):
@@ -13,6 +26,19 @@ class CsvReader:
         """
         self._path = path
 
+    def _read_csv(self, file_name: str, dtype: dict[str, str]) -> "pd.DataFrame":
+        # pandas is imported lazily: importing this module (e.g. via InputData) should not pay its import cost
+        import pandas as pd
+
+        return pd.read_csv(
+            os.path.join(self._path, file_name),
+            sep=",",
+            usecols=list(dtype),
+            dtype=dtype,
+            engine="c",
+            low_memory=False,
+        )
+
     def get_wafers(self) -> list[Wafer]:
         """
 
@@ -21,7 +47,11 @@ class CsvReader:
         wafers : list[Wafer]
             The list of wafers
         """
-        raise NotImplementedError
+        df = self._read_csv("wafers.csv", dtype=_WAFERS_DTYPES)
+        return [
+            Wafer(name=name, priority=sys.intern(priority), recipe=recipe)
+            for name, priority, recipe in zip(df["name"].values, df["priority"].values, df["recipe"].values)
+        ]
 
     def get_machines(self) -> list[Machine]:
         """
@@ -32,4 +62,13 @@ class CsvReader:
             The list of machines
 
         """
-        raise NotImplementedError
+        df = self._read_csv("machines_recipes.csv", dtype=_MACHINES_RECIPES_DTYPES)
+        processing_time_by_recipe_by_machine: dict[str, dict[RecipeId, int]] = defaultdict(dict)
+        for machine_name, recipe, processing_time in zip(
+            df["machine"].values, df["recipe"].values, df["processing_time"].values
+        ):
+            processing_time_by_recipe_by_machine[machine_name][recipe] = int(round(processing_time * 60))
+        return [
+            Machine(name=machine_name, processing_time_by_recipe=processing_time_by_recipe)
+            for machine_name, processing_time_by_recipe in processing_time_by_recipe_by_machine.items()
+        ]
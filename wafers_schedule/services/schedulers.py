@@ -1,7 +1,74 @@
+import heapq
+import math
 from abc import ABC, abstractmethod
+from collections import defaultdict, deque
+from datetime import datetime
+from fractions import Fraction
+from operator import attrgetter
+from typing import NamedTuple
+
+import numpy as np
+from ortools.sat.python import cp_model
 
 from domain_models.input_data import InputData
-from domain_models.schedule import Schedule
+from domain_models.machine import Machine
+from domain_models.recipe import RecipeId
+from domain_models.schedule import DispatchDecision, Schedule
+from domain_models.wafer import Wafer
+
+# The input data is a snapshot of the fab taken at this time: every wafer is available for processing from then on
+SNAPSHOT_TIMESTAMP = datetime(2022, 11, 14, 9, 0)
+
+# CP-SAT needs integer objective coefficients: priority weights must be fractions with at most this denominator
+_CP_SAT_MAX_WEIGHT_DENOMINATOR = 1000
+
+
+def _check_wafers_can_be_processed(input_data: InputData) -> None:
+    unprocessable_wafers = [
+        wafer.name for wafer in input_data.wafers if not input_data.machines_by_recipe.get(wafer.recipe)
+    ]
+    if unprocessable_wafers:
+        raise ValueError(f"No machine can process wafers: {unprocessable_wafers}")
+
+
+class Assignment(NamedTuple):
+    """
+    A wafer dispatched to a machine, with start and end times in seconds from the scheduler's initial timestamp.
+    """
+    wafer: Wafer
+    start: int
+    end: int
+
+
+def _to_datetimes(initial_timestamp: datetime, offsets: list[int]) -> list[datetime]:
+    """
+    Converts offsets in seconds from `initial_timestamp` to datetimes with a single vectorized NumPy operation.
+    """
+    timestamps = np.datetime64(initial_timestamp, "s") + np.array(offsets, dtype="timedelta64[s]")
+    return timestamps.astype("datetime64[us]").tolist()
+
+
+def _create_schedule(
+    initial_timestamp: datetime, assignments_by_machine: dict[Machine, list[Assignment]]
+) -> Schedule:
+    """
+    Builds the schedule from the assignments of each machine, given in start order, with wafers released at
+    `initial_timestamp`. Decisions are listed by machine name, then start time.
+    """
+    machines_and_assignments = [
+        (machine, assignment)
+        for machine in sorted(assignments_by_machine, key=attrgetter("name"))
+        for assignment in assignments_by_machine[machine]
+    ]
+    starts = _to_datetimes(initial_timestamp, [assignment.start for _, assignment in machines_and_assignments])
+    ends = _to_datetimes(initial_timestamp, [assignment.end for _, assignment in machines_and_assignments])
+    return Schedule(
+        dispatch_decisions=[
+            DispatchDecision(wafer=assignment.wafer, machine=machine, start=start, end=end)
+            for (machine, assignment), start, end in zip(machines_and_assignments, starts, ends)
+        ],
+        release_timestamp=initial_timestamp,
+    )
 
 
 class Scheduler(ABC):
@@ -19,11 +86,390 @@ class Scheduler(ABC):
 
 
 class LegacyScheduler(Scheduler):
+    """
+    Simulates the fab's current operating policy: whenever a machine is free, the highest priority wafer (ties broken
+    alphabetically) that can start immediately is dispatched to its alphabetically first free compatible machine.
+    Times are tracked as seconds elapsed since `initial_timestamp`.
+    """
+    def __init__(self, input_data: InputData):
+        super().__init__(input_data)
+        self.initial_timestamp = SNAPSHOT_TIMESTAMP
+        self.wafers_list = self._initialize_wafers_list()
+        self.machines_list = self._input_data.machines_sorted_by_name
+        # Sets of machines are encoded as bitmasks with bit i standing for machines_list[i], so the lowest set bit of
+        # a mask is its alphabetically first machine
+        self._machine_bits = {machine: 1 << index for index, machine in enumerate(self.machines_list)}
+        self._compatible_machines_mask_by_recipe: dict[RecipeId, int] = {
+            recipe: sum(self._machine_bits[machine] for machine in machines)
+            for recipe, machines in self._input_data.machines_by_recipe.items()
+        }
+
     def schedule(self) -> Schedule:
-        raise NotImplementedError
+        self._check_wafers_can_be_processed()
+        self._initialize_simulation_state()
+        while not self._check_simulation_termination():
+            self._update_remaining_wafers()
+            self._update_busy_machines()
+        return self._create_final_schedule_object()
+
+    def _initialize_simulation_state(self) -> None:
+        self.current_time = 0
+        # Event queue of busy machines as (free time, machine name, machine); the name breaks ties deterministically
+        self._busy_machines_heap: list[tuple[int, str, Machine]] = []
+        self._free_machines_mask = (1 << len(self.machines_list)) - 1
+        # Wafers dispatched to each machine. Machines are only dispatched once free, so
+        # each list is recorded in start order
+        self.assignments_by_machine: dict[Machine, list[Assignment]] = defaultdict(list)
+        # Wafers not yet dispatched, grouped by recipe and kept in priority order within each group
+        self._pending_wafers_by_recipe: dict[RecipeId, deque[Wafer]] = defaultdict(deque)
+        for wafer in self.wafers_list:
+            self._pending_wafers_by_recipe[wafer.recipe].append(wafer)
+
+    def _initialize_wafers_list(self) -> tuple[Wafer, ...]:
+        return self._input_data.wafers_sorted_by_priority
+
+    def _check_wafers_can_be_processed(self) -> None:
+        _check_wafers_can_be_processed(self._input_data)
+
+    def _check_simulation_termination(self) -> bool:
+        return not any(self._pending_wafers_by_recipe.values())
+
+    def _update_remaining_wafers(self) -> None:
+        # Merges the recipe groups in priority order, so only the head of each group is looked at. Machines are taken
+        # but never released within a time step, hence a group whose head cannot start has to wait for the next one
+        candidates = [
+            (pending_wafers[0].priority_id, pending_wafers[0].name, recipe)
+            for recipe, pending_wafers in self._pending_wafers_by_recipe.items()
+            if pending_wafers
+        ]
+        heapq.heapify(candidates)
+        while candidates:
+            _, _, recipe = heapq.heappop(candidates)
+            pending_wafers = self._pending_wafers_by_recipe[recipe]
+            machine = self._evaluate_wafer_machine_assignment(pending_wafers[0])
+            if machine is None:
+                continue
+            self._update_assignment(pending_wafers.popleft(), machine)
+            if pending_wafers:
+                heapq.heappush(candidates, (pending_wafers[0].priority_id, pending_wafers[0].name, recipe))
+
+    def _evaluate_wafer_machine_assignment(self, wafer: Wafer) -> Machine | None:
+        """
+        Returns the machine `wafer` should be dispatched to at the current time, or None if it has to wait.
+        """
+        available_machines = self._compatible_machines_mask_by_recipe[wafer.recipe] & self._free_machines_mask
+        if available_machines:
+            return self.machines_list[(available_machines & -available_machines).bit_length() - 1]
+        return None
+
+    def _update_assignment(self, wafer: Wafer, machine: Machine) -> None:
+        end_time = self.current_time + machine.processing_time_by_recipe[wafer.recipe]
+        self.assignments_by_machine[machine].append(Assignment(wafer, self.current_time, end_time))
+        heapq.heappush(self._busy_machines_heap, (end_time, machine.name, machine))
+        self._free_machines_mask &= ~self._machine_bits[machine]
+
+    def _update_busy_machines(self) -> None:
+        """
+        Advances the current time to the moment the next busy machine(s) become free, and releases them.
+        """
+        if not self._busy_machines_heap:
+            return
+        self.current_time = self._busy_machines_heap[0][0]
+        while self._busy_machines_heap and self._busy_machines_heap[0][0] == self.current_time:
+            _, _, machine = heapq.heappop(self._busy_machines_heap)
+            self._release_machine(machine)
+
+    def _release_machine(self, machine: Machine) -> None:
+        self._free_machines_mask |= self._machine_bits[machine]
+
+    def _create_final_schedule_object(self) -> Schedule:
+        return _create_schedule(self.initial_timestamp, self.assignments_by_machine)
 
 
 class BetterScheduler(LegacyScheduler):
+    """
+    Dispatches (wafer, machine) pairs by the weighted shortest processing time rule: whenever machines are free, the
+    pair with the largest priority weight per unit of processing time is dispatched first. Within a recipe the best
+    pair is always its highest priority pending wafer on its fastest free machine, so candidates are read from a
+    priority queue of free machines per recipe instead of scanning every wafer and machine.
+    """
+    def _initialize_simulation_state(self) -> None:
+        super()._initialize_simulation_state()
+        # Free machines per recipe as (processing time, machine name, machine). Entries of machines that have been
+        # dispatched since they were pushed are stale, and dropped lazily when they reach the top of the heap
+        self._free_machines_heap_by_recipe: dict[RecipeId, list[tuple[int, str, Machine]]] = {}
+        for recipe, machines in self._input_data.machines_by_recipe.items():
+            heap = [(machine.processing_time_by_recipe[recipe], machine.name, machine) for machine in machines]
+            heapq.heapify(heap)
+            self._free_machines_heap_by_recipe[recipe] = heap
+
+    def _update_remaining_wafers(self) -> None:
+        while (assignment := self._select_best_assignment()) is not None:
+            wafer, machine = assignment
+            self._pending_wafers_by_recipe[wafer.recipe].popleft()
+            self._update_assignment(wafer, machine)
+
+    def _select_best_assignment(self) -> tuple[Wafer, Machine] | None:
+        best_key, best_assignment = None, None
+        for pending_wafers in self._pending_wafers_by_recipe.values():
+            if not pending_wafers:
+                continue
+            wafer = pending_wafers[0]
+            machine = self._evaluate_wafer_machine_assignment(wafer)
+            if machine is None:
+                continue
+            key = (-wafer.priority_number / machine.processing_time_by_recipe[wafer.recipe], wafer.name, machine.name)
+            if best_key is None or key < best_key:
+                best_key, best_assignment = key, (wafer, machine)
+        return best_assignment
+
+    def _evaluate_wafer_machine_assignment(self, wafer: Wafer) -> Machine | None:
+        """
+        Returns the fastest free machine compatible with `wafer`, or None if they are all busy.
+        """
+        heap = self._free_machines_heap_by_recipe[wafer.recipe]
+        while heap and not self._machine_bits[heap[0][2]] & self._free_machines_mask:
+            heapq.heappop(heap)
+        return heap[0][2] if heap else None
+
+    def _release_machine(self, machine: Machine) -> None:
+        super()._release_machine(machine)
+        for recipe, processing_time in machine.processing_time_by_recipe.items():
+            heapq.heappush(self._free_machines_heap_by_recipe[recipe], (processing_time, machine.name, machine))
+
+
+class CPSATScheduler(Scheduler):
+    """
+    Schedules the fab with a constraint programming model solved by OR-Tools CP-SAT: every wafer is processed on
+    exactly one compatible machine, wafers on the same machine do not overlap, and the total priority-weighted cycle
+    time is minimized, ties being broken by the makespan. Times are modelled as integer multiples of the greatest
+    common divisor of the processing times.
+    """
+    def __init__(
+        self,
+        input_data: InputData,
+        time_limit_seconds: float = 60.0,
+        num_workers: int = 8,
+        warm_start_schedule: Schedule | None = None,
+    ):
+        super().__init__(input_data)
+        self.initial_timestamp = SNAPSHOT_TIMESTAMP
+        # Schedule of this input's wafers and machines used as solution hint; defaults to the BetterScheduler one
+        self.warm_start_schedule = warm_start_schedule
+        self.time_limit_seconds = time_limit_seconds
+        # CP-SAT defaults to one worker per core; its portfolio of (LNS) workers finds much better schedules than a
+        # single search worker, even when they share fewer cores
+        self.num_workers = num_workers
+        # Without any processing time (no machines) there is nothing to schedule: fall back to seconds
+        self.time_unit = math.gcd(
+            *(
+                processing_time
+                for machine in self._input_data.machines
+                for processing_time in machine.processing_time_by_recipe.values()
+            )
+        ) or 1
+        self.identical_machine_groups = self._find_identical_machine_groups()
+
+    def _find_identical_machine_groups(self) -> list[list[Machine]]:
+        """
+        Groups machines that run the same recipes in the same processing times, in name order. Any schedule stays
+        valid when wafers are swapped between two identical machines.
+        """
+        machines_by_processing_times: dict[frozenset, list[Machine]] = defaultdict(list)
+        for machine in self._input_data.machines_sorted_by_name:
+            machines_by_processing_times[frozenset(machine.processing_time_by_recipe.items())].append(machine)
+        return [machines for machines in machines_by_processing_times.values() if len(machines) > 1]
+
     def schedule(self) -> Schedule:
-        raise NotImplementedError
+        _check_wafers_can_be_processed(self._input_data)
+        self._build_model()
+        warm_start_schedule = self.warm_start_schedule
+        if warm_start_schedule is None:
+            warm_start_schedule = BetterScheduler(input_data=self._input_data).schedule()
+        self._add_solution_hint(warm_start_schedule)
+        self._solve_model()
+        return self._create_final_schedule_object()
+
+    def _build_model(self) -> None:
+        self.model = cp_model.CpModel()
+        # Processing every wafer back to back on its slowest compatible machine bounds any sensible schedule
+        horizon = sum(
+            max(
+                machine.processing_time_by_recipe[wafer.recipe]
+                for machine in self._input_data.machines_by_recipe[wafer.recipe]
+            )
+            for wafer in self._input_data.wafers
+        ) // self.time_unit
+        horizon_by_machine = self._compute_horizon_by_machine()
+
+        self.start_variables: dict[tuple[Wafer, Machine], cp_model.IntVar] = {}
+        self.presence_variables: dict[tuple[Wafer, Machine], cp_model.IntVar] = {}
+        self.end_variables: dict[Wafer, cp_model.IntVar] = {}
+        intervals_by_machine: dict[Machine, list[cp_model.IntervalVar]] = defaultdict(list)
+        load_by_machine: dict[Machine, list[cp_model.LinearExpr]] = defaultdict(list)
+        for wafer in self._input_data.wafers:
+            compatible_machines = self._input_data.machines_by_recipe[wafer.recipe]
+            end_horizon = min(horizon, max(horizon_by_machine[machine] for machine in compatible_machines))
+            end = self.model.new_int_var(0, end_horizon, f"end_{wafer.name}")
+            self.end_variables[wafer] = end
+            for machine in compatible_machines:
+                duration = machine.processing_time_by_recipe[wafer.recipe] // self.time_unit
+                start = self.model.new_int_var(
+                    0, min(horizon, horizon_by_machine[machine]) - duration, f"start_{wafer.name}_{machine.name}"
+                )
+                presence = self.model.new_bool_var(f"presence_{wafer.name}_{machine.name}")
+                intervals_by_machine[machine].append(
+                    self.model.new_optional_fixed_size_interval_var(
+                        start, duration, presence, f"interval_{wafer.name}_{machine.name}"
+                    )
+                )
+                self.model.add(end == start + duration).only_enforce_if(presence)
+                load_by_machine[machine].append(duration * presence)
+                self.start_variables[wafer, machine] = start
+                self.presence_variables[wafer, machine] = presence
+            self.model.add_exactly_one(self.presence_variables[wafer, machine] for machine in compatible_machines)
+
+        for intervals in intervals_by_machine.values():
+            self.model.add_no_overlap(intervals)
+
+        # Symmetry breaking: identical machines are used in non-increasing order of load, so the search does not
+        # explore every relabelling of the same schedule
+        for machines in self.identical_machine_groups:
+            for machine, next_machine in zip(machines, machines[1:]):
+                self.model.add(sum(load_by_machine[machine]) >= sum(load_by_machine[next_machine]))
+
+        # Every wafer is released at time zero and some wafer starts then in any left-shifted schedule, so the
+        # makespan is the latest end
+        self.makespan_variable = self.model.new_int_var(0, horizon, "makespan")
+        if self.end_variables:
+            self.model.add_max_equality(self.makespan_variable, list(self.end_variables.values()))
+
+        # Lexicographic objective: the PWCT first, then the makespan to break ties. The makespan never exceeds the
+        # horizon, so scaling the PWCT by horizon + 1 makes any PWCT improvement outweigh any makespan change
+        objective_coefficients = self._compute_objective_coefficients()
+        weighted_cycle_time = sum(
+            objective_coefficients[wafer.priority_number] * end for wafer, end in self.end_variables.items()
+        )
+        self.model.minimize((horizon + 1) * weighted_cycle_time + self.makespan_variable)
+
+    def _compute_objective_coefficients(self) -> dict[float, int]:
+        """
+        Scales the priority weights to integers with exactly the same ratios, as CP-SAT requires integer objective
+        coefficients.
+
+        Returns
+        -------
+        dict[float, int] : Integer objective coefficient of each priority weight
+
+        Raises
+        ------
+        ValueError
+            If a weight is not a fraction with a denominator of at most `_CP_SAT_MAX_WEIGHT_DENOMINATOR`
+        """
+        weights = {wafer.priority_number for wafer in self._input_data.wafers}
+        fractions = {weight: Fraction(weight).limit_denominator(_CP_SAT_MAX_WEIGHT_DENOMINATOR) for weight in weights}
+        inexact_weights = sorted(weight for weight, fraction in fractions.items() if not math.isclose(fraction, weight))
+        if inexact_weights:
+            raise ValueError(f"Priority weights cannot be scaled exactly to integers: {inexact_weights}")
+        scale = math.lcm(*(fraction.denominator for fraction in fractions.values()))
+        return {weight: int(fraction * scale) for weight, fraction in fractions.items()}
+
+    def _compute_horizon_by_machine(self) -> dict[Machine, int]:
+        """
+        Bounds the end of the last wafer on each machine, in time units, by the time the machine takes to process every
+        wafer it is compatible with.
+
+        Notes
+        -----
+        All wafers are available from the start, so any schedule can be left-shifted until every machine processes its
+        wafers back to back without making a wafer finish later. The bound holds for such schedules, which include an
+        optimal one and the hinted (non-delay) heuristic schedule.
+        """
+        wafers_count_by_recipe: dict[RecipeId, int] = defaultdict(int)
+        for wafer in self._input_data.wafers:
+            wafers_count_by_recipe[wafer.recipe] += 1
+        return {
+            machine: sum(
+                wafers_count_by_recipe[recipe] * processing_time
+                for recipe, processing_time in machine.processing_time_by_recipe.items()
+            ) // self.time_unit
+            for machine in self._input_data.machines
+        }
+
+    def _add_solution_hint(self, schedule: Schedule) -> None:
+        """
+        Warm-starts the search from `schedule`: CP-SAT uses the hinted values to build its first solution, so it starts
+        from the heuristic's objective instead of searching for a feasible schedule from scratch. The hint keeps the
+        schedule's machine assignments and sequences, processed back to back from the release time.
+
+        Raises
+        ------
+        ValueError
+            If `schedule` dispatches a wafer to a machine that is not one of its compatible machines in the input data,
+            e.g. when the schedule was built on other wafer or machine objects, or dispatches a wafer more than once
+        """
+        decisions_by_machine: dict[Machine, list[DispatchDecision]] = defaultdict(list)
+        hinted_wafers = set()
+        for decision in schedule.dispatch_decisions:
+            if (decision.wafer, decision.machine) not in self.start_variables:
+                raise ValueError(
+                    f"Cannot warm start from wafer {decision.wafer.name} on machine {decision.machine.name}: not a"
+                    " compatible pair of this input's wafers and machines"
+                )
+            if decision.wafer in hinted_wafers:
+                raise ValueError(f"Cannot warm start from a schedule that dispatches {decision.wafer.name} twice")
+            hinted_wafers.add(decision.wafer)
+            decisions_by_machine[decision.machine].append(decision)
+
+        # Left-shift each machine's sequence: wafers only end earlier, and the hint stays within the per-machine
+        # domains of the model whatever the schedule's timestamps are
+        hinted_times_by_machine: dict[Machine, list[tuple[Wafer, int, int]]] = {}
+        load_by_machine: dict[Machine, int] = defaultdict(int)
+        for machine, decisions in decisions_by_machine.items():
+            hinted_times = []
+            end = 0
+            for decision in sorted(decisions, key=attrgetter("start_ts", "end_ts")):
+                start, end = end, end + machine.processing_time_by_recipe[decision.wafer.recipe] // self.time_unit
+                hinted_times.append((decision.wafer, start, end))
+            hinted_times_by_machine[machine] = hinted_times
+            load_by_machine[machine] = end
+
+        # Relabel identical machines so that the hint satisfies the symmetry breaking constraints
+        relabelled_machines = {}
+        for machines in self.identical_machine_groups:
+            by_decreasing_load = sorted(machines, key=lambda machine: -load_by_machine[machine])
+            relabelled_machines.update(zip(by_decreasing_load, machines))
+
+        dispatched_machine_by_wafer = {}
+        makespan = 0
+        for machine, hinted_times in hinted_times_by_machine.items():
+            machine = relabelled_machines.get(machine, machine)
+            for wafer, start, end in hinted_times:
+                dispatched_machine_by_wafer[wafer] = machine
+                self.model.add_hint(self.start_variables[wafer, machine], start)
+                self.model.add_hint(self.end_variables[wafer], end)
+                makespan = max(makespan, end)
+        self.model.add_hint(self.makespan_variable, makespan)
+        for (wafer, machine), presence in self.presence_variables.items():
+            self.model.add_hint(presence, dispatched_machine_by_wafer.get(wafer) is machine)
+
+    def _solve_model(self) -> None:
+        self.solver = cp_model.CpSolver()
+        self.solver.parameters.max_time_in_seconds = self.time_limit_seconds
+        self.solver.parameters.num_workers = self.num_workers
+        status = self.solver.solve(self.model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            raise RuntimeError(f"CP-SAT did not find a feasible schedule: {self.solver.status_name(status)}")
 
+    def _create_final_schedule_object(self) -> Schedule:
+        assignments_by_machine: dict[Machine, list[Assignment]] = defaultdict(list)
+        for (wafer, machine), presence in self.presence_variables.items():
+            if not self.solver.boolean_value(presence):
+                continue
+            start = self.solver.value(self.start_variables[wafer, machine]) * self.time_unit
+            end = start + machine.processing_time_by_recipe[wafer.recipe]
+            assignments_by_machine[machine].append(Assignment(wafer, start, end))
+        # Only each machine's (short) list needs sorting by start time, not the whole schedule
+        for assignments in assignments_by_machine.values():
+            assignments.sort(key=attrgetter("start"))
+        return _create_schedule(self.initial_timestamp, assignments_by_machine)
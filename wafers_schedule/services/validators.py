@@ -1,4 +1,7 @@
 from abc import ABC, abstractmethod
+from collections import defaultdict
+
+import numpy as np
 
 from domain_models.input_data import InputData
 from domain_models.schedule import Schedule
@@ -22,9 +25,13 @@ class ScheduleValidator(ABC):
 class AllWafersHaveBeenScheduled(ScheduleValidator):
     def validate(self) -> bool:
         """
-        Checks that all wafers have been scheduled.
+        Checks that all wafers have been scheduled, each exactly once.
         """
-        raise NotImplementedError
+        scheduled_wafers = [decision.wafer for decision in self._schedule.dispatch_decisions]
+        unique_scheduled_wafers = set(scheduled_wafers)
+        return len(unique_scheduled_wafers) == len(scheduled_wafers) and unique_scheduled_wafers == set(
+            self._input_data.wafers
+        )
 
 
 class AllWafersAreOnCompatibleMachines(ScheduleValidator):
@@ -32,7 +39,13 @@ class AllWafersAreOnCompatibleMachines(ScheduleValidator):
         """
         Checks that each wafer has been scheduled on a machine with a compatible recipe.
         """
-        raise NotImplementedError
+        compatible_machines_by_recipe = {
+            recipe: set(machines) for recipe, machines in self._input_data.machines_by_recipe.items()
+        }
+        return all(
+            decision.machine in compatible_machines_by_recipe.get(decision.wafer.recipe, ())
+            for decision in self._schedule.dispatch_decisions
+        )
 
 
 class NoOverlapsOnSameMachine(ScheduleValidator):
@@ -40,7 +53,19 @@ class NoOverlapsOnSameMachine(ScheduleValidator):
         """
         Checks that there are no overlapping wafers scheduled on the same machine.
         """
-        raise NotImplementedError
+        times_by_machine_name: dict[str, list[tuple[int, int]]] = defaultdict(list)
+        for decision in self._schedule.dispatch_decisions:
+            times_by_machine_name[decision.machine.name].append((decision.start_ts, decision.end_ts))
+        for times in times_by_machine_name.values():
+            starts, ends = np.array(times, dtype=np.int64).T
+            # Decisions need not be listed in start order: each machine's intervals are sorted by start, then end (so
+            # that a zero-length interval comes before one starting at the same time), before comparing every end with
+            # the next start
+            order = np.lexsort((ends, starts))
+            starts, ends = starts[order], ends[order]
+            if not (np.all(starts <= ends) and np.all(ends[:-1] <= starts[1:])):
+                return False
+        return True
 
 
 class ScheduleChecker:
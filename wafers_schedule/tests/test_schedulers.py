@@ -0,0 +1,139 @@
+"""
+Checks the dispatching schedulers against straightforward simulations of their rules, which rescan every wafer and
+machine at each step instead of relying on the schedulers' queues, heaps and bitmasks.
+"""
+import os
+import random
+
+import pytest
+
+from domain_models.input_data import InputData
+from domain_models.machine import Machine
+from domain_models.schedule import Schedule
+from domain_models.wafer import PRIORITY_IDS, Wafer
+from services.schedulers import SNAPSHOT_TIMESTAMP, BetterScheduler, LegacyScheduler
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def _compatible_pairs(wafers, machines, free_at, time):
+    return [
+        (wafer, machine)
+        for wafer in wafers
+        for machine in machines
+        if wafer.recipe in machine.processing_time_by_recipe and free_at[machine] <= time
+    ]
+
+
+def _simulate(input_data: InputData, select_pair) -> dict[str, tuple[str, int, int]]:
+    """
+    Runs the dispatching loop: at each time, `select_pair` picks among all (pending wafer, free compatible machine)
+    pairs until none is left, then the time advances to the next moment a machine frees up.
+
+    Returns
+    -------
+    dict[str, tuple[str, int, int]] : Machine name, start and end (seconds from the snapshot) of each wafer
+    """
+    pending = list(input_data.wafers)
+    free_at = {machine: 0 for machine in input_data.machines}
+    time = 0
+    dispatched = {}
+    while pending:
+        while pairs := _compatible_pairs(pending, input_data.machines, free_at, time):
+            wafer, machine = select_pair(pairs)
+            free_at[machine] = time + machine.processing_time_by_recipe[wafer.recipe]
+            dispatched[wafer.name] = (machine.name, time, free_at[machine])
+            pending.remove(wafer)
+        if pending:
+            time = min(free_time for free_time in free_at.values() if free_time > time)
+    return dispatched
+
+
+def _reference_legacy(input_data: InputData) -> dict[str, tuple[str, int, int]]:
+    # README rules: the highest priority wafer (then alphabetically first) that can start, on its alphabetically
+    # first free compatible machine
+    return _simulate(
+        input_data,
+        lambda pairs: min(pairs, key=lambda pair: (PRIORITY_IDS[pair[0].priority], pair[0].name, pair[1].name)),
+    )
+
+
+def _reference_better(input_data: InputData) -> dict[str, tuple[str, int, int]]:
+    # Weighted shortest processing time over all pairs, ties broken by wafer then machine name
+    return _simulate(
+        input_data,
+        lambda pairs: min(
+            pairs,
+            key=lambda pair: (
+                -pair[0].priority_number / pair[1].processing_time_by_recipe[pair[0].recipe],
+                pair[0].name,
+                pair[1].name,
+            ),
+        ),
+    )
+
+
+def _dispatched(schedule: Schedule) -> dict[str, tuple[str, int, int]]:
+    return {
+        decision.wafer.name: (
+            decision.machine.name,
+            int((decision.start - SNAPSHOT_TIMESTAMP).total_seconds()),
+            int((decision.end - SNAPSHOT_TIMESTAMP).total_seconds()),
+        )
+        for decision in schedule.dispatch_decisions
+    }
+
+
+def _random_input_data(seed: int) -> InputData:
+    rng = random.Random(seed)
+    recipes = [f"R{index}" for index in range(rng.randint(1, 6))]
+    machines = [
+        Machine(
+            name=f"M{index}",
+            processing_time_by_recipe={
+                recipe: 60 * rng.randint(1, 5) for recipe in rng.sample(recipes, rng.randint(1, len(recipes)))
+            },
+        )
+        for index in range(rng.randint(1, 8))
+    ]
+    processable_recipes = sorted({recipe for machine in machines for recipe in machine.processing_time_by_recipe})
+    wafers = [
+        Wafer(name=f"W{index:03d}", priority=rng.choice(list(PRIORITY_IDS)), recipe=rng.choice(processable_recipes))
+        for index in range(rng.randint(1, 60))
+    ]
+    # Shuffled so that the schedulers cannot depend on the input order
+    rng.shuffle(wafers)
+    rng.shuffle(machines)
+    return InputData(wafers=wafers, machines=machines)
+
+
+@pytest.mark.parametrize(
+    "scheduler_class, reference", [(LegacyScheduler, _reference_legacy), (BetterScheduler, _reference_better)]
+)
+def test_scheduler_matches_reference_on_bundled_data(scheduler_class, reference):
+    input_data = InputData.from_csv(path=DATA_PATH)
+    assert _dispatched(scheduler_class(input_data).schedule()) == reference(input_data)
+
+
+@pytest.mark.parametrize("seed", range(100))
+@pytest.mark.parametrize(
+    "scheduler_class, reference", [(LegacyScheduler, _reference_legacy), (BetterScheduler, _reference_better)]
+)
+def test_scheduler_matches_reference_on_random_data(scheduler_class, reference, seed):
+    input_data = _random_input_data(seed)
+    assert _dispatched(scheduler_class(input_data).schedule()) == reference(input_data)
+
+
+def test_legacy_kpis_on_bundled_data():
+    schedule = LegacyScheduler(InputData.from_csv(path=DATA_PATH)).schedule()
+    assert schedule.makespan == pytest.approx(20.5)
+    assert schedule.priority_weighted_cycle_time == pytest.approx(187.3)
+
+
+def test_unprocessable_wafer_is_rejected():
+    input_data = InputData(
+        wafers=[Wafer(name="W1", priority="red", recipe="R2")],
+        machines=[Machine(name="M1", processing_time_by_recipe={"R1": 60})],
+    )
+    with pytest.raises(ValueError, match="W1"):
+        LegacyScheduler(input_data).schedule()
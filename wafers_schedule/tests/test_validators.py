@@ -0,0 +1,81 @@
+import os
+from datetime import timedelta
+
+import pytest
+
+from domain_models.input_data import InputData
+from domain_models.schedule import DispatchDecision, Schedule
+from services.schedulers import SNAPSHOT_TIMESTAMP, LegacyScheduler
+from services.validators import AllWafersAreOnCompatibleMachines, AllWafersHaveBeenScheduled, NoOverlapsOnSameMachine
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture(scope="module")
+def input_data() -> InputData:
+    return InputData.from_csv(path=DATA_PATH)
+
+
+@pytest.fixture(scope="module")
+def schedule(input_data) -> Schedule:
+    return LegacyScheduler(input_data).schedule()
+
+
+def _decision(input_data, wafer_index, machine, start_hours, end_hours) -> DispatchDecision:
+    return DispatchDecision(
+        wafer=input_data.wafers[wafer_index],
+        machine=machine,
+        start=SNAPSHOT_TIMESTAMP + timedelta(hours=start_hours),
+        end=SNAPSHOT_TIMESTAMP + timedelta(hours=end_hours),
+    )
+
+
+@pytest.mark.parametrize(
+    "validator_class", [AllWafersHaveBeenScheduled, AllWafersAreOnCompatibleMachines, NoOverlapsOnSameMachine]
+)
+def test_valid_schedule_passes(input_data, schedule, validator_class):
+    assert validator_class(input_data=input_data, schedule=schedule).validate()
+
+
+def test_missing_wafer_fails(input_data, schedule):
+    incomplete = Schedule(schedule.dispatch_decisions[1:])
+    assert not AllWafersHaveBeenScheduled(input_data=input_data, schedule=incomplete).validate()
+
+
+def test_wafer_scheduled_twice_fails(input_data, schedule):
+    duplicated = Schedule(schedule.dispatch_decisions + schedule.dispatch_decisions[:1])
+    assert not AllWafersHaveBeenScheduled(input_data=input_data, schedule=duplicated).validate()
+
+
+def test_incompatible_machine_fails(input_data, schedule):
+    decision = schedule.dispatch_decisions[0]
+    incompatible_machine = next(
+        machine
+        for machine in input_data.machines
+        if decision.wafer.recipe not in machine.processing_time_by_recipe
+    )
+    moved = DispatchDecision(decision.wafer, incompatible_machine, decision.start, decision.end)
+    invalid = Schedule([moved] + schedule.dispatch_decisions[1:])
+    assert not AllWafersAreOnCompatibleMachines(input_data=input_data, schedule=invalid).validate()
+
+
+def test_overlap_fails_whatever_the_order(input_data):
+    machine = input_data.machines[0]
+    first = _decision(input_data, 0, machine, 0, 2)
+    second = _decision(input_data, 1, machine, 1, 3)
+    for decisions in ([first, second], [second, first]):
+        assert not NoOverlapsOnSameMachine(input_data=input_data, schedule=Schedule(decisions)).validate()
+
+
+def test_back_to_back_and_zero_length_intervals_pass_whatever_the_order(input_data):
+    machine = input_data.machines[0]
+    zero_length = _decision(input_data, 0, machine, 0, 0)
+    first = _decision(input_data, 1, machine, 0, 1)
+    second = _decision(input_data, 2, machine, 1, 2)
+    for decisions in ([zero_length, first, second], [second, first, zero_length]):
+        assert NoOverlapsOnSameMachine(input_data=input_data, schedule=Schedule(decisions)).validate()
+
+
+def test_end_before_start_fails(input_data):
+    reversed_interval = _decision(input_data, 0, input_data.machines[0], 2, 1)
+    assert not NoOverlapsOnSameMachine(input_data=input_data, schedule=Schedule([reversed_interval])).validate()